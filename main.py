@@ -1,45 +1,40 @@
 """EventPlayback - Lightweight Version"""
 
 import customtkinter as ctk
-from tkinter import filedialog
+from tkinter import filedialog, TclError
+import heapq
+from bisect import bisect_right
 import json
 import logging
+import math
 import os
+import queue
+import struct
+import sys
 import time
 import threading
 import ctypes
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Callable, List, Dict, Union, Any
+from functools import lru_cache, partial
+from typing import Optional, Callable, Iterator, List, Dict, Tuple, Union, Any
 
 # Version information (can be set via environment variable during build)
 __version__ = os.getenv("EVENTPLAYBACK_VERSION", "dev")
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
-import keyboard
 from pynput import mouse, keyboard as pynput_kb
-from pynput.mouse import Controller as MouseController, Button as MouseButton
-from pynput.keyboard import Controller as KeyboardController, Key
+from pynput.mouse import Button as MouseButton
+from pynput.keyboard import Key
 
-# DPI Awareness setting (Windows) - Prevents coordinate misalignment
 try:
-    ctypes.windll.shcore.SetProcessDpiAwareness(2)  # Per-Monitor DPI Aware
-except Exception:
-    try:
-        ctypes.windll.user32.SetProcessDPIAware()  # System DPI Aware (fallback)
-    except Exception:
-        pass
-
-# Theme setting
-ctk.set_appearance_mode("dark")
+    import orjson  # Optional: C-accelerated JSON, noticeably faster for large macros
+except ImportError:
+    orjson = None
 
 
 # === Data Models ===
@@ -52,7 +47,28 @@ class EventType(Enum):
     KEY_RELEASE = "key_release"
 
 
-@dataclass
+# Slotted dataclasses drop the per-instance __dict__ (dataclass slots= needs Python 3.10+)
+_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Event types are stored as small integer ids in ring buffers and binary files
+_EVENT_TYPES: Tuple[EventType, ...] = tuple(EventType)
+_TYPE_IDS: Dict[EventType, int] = {t: i for i, t in enumerate(_EVENT_TYPES)}
+_TYPES_BY_VALUE: Dict[str, EventType] = {t.value: t for t in EventType}
+
+# Largest accepted event timestamp (seconds) - Bounds loaded files so playback timing math can't overflow
+MAX_TIMESTAMP = 365 * 24 * 3600.0
+
+# Optional fields that are meaningful for each event type (used by Event.to_dict)
+_FIELDS_BY_TYPE: Dict[EventType, Tuple[str, ...]] = {
+    EventType.MOUSE_MOVE: ("x", "y"),
+    EventType.MOUSE_CLICK: ("x", "y", "button", "pressed"),
+    EventType.MOUSE_SCROLL: ("x", "y", "scroll_dx", "scroll_dy"),
+    EventType.KEY_PRESS: ("key", "pressed"),
+    EventType.KEY_RELEASE: ("key", "pressed"),
+}
+
+
+@dataclass(**_SLOTS)
 class Event:
     type: EventType
     timestamp: float
@@ -66,7 +82,7 @@ class Event:
 
     def to_dict(self) -> Dict[str, Any]:
         d = {"type": self.type.value, "timestamp": self.timestamp}
-        for k in ["x", "y", "button", "key", "pressed", "scroll_dx", "scroll_dy"]:
+        for k in _FIELDS_BY_TYPE[self.type]:
             v = getattr(self, k)
             if v is not None:
                 d[k] = v
@@ -82,6 +98,8 @@ class Event:
             raise ValueError(f"Invalid event type: {d['type']}")
         if not isinstance(d["timestamp"], (int, float)):
             raise ValueError(f"timestamp must be a number: {type(d['timestamp'])}")
+        if not abs(d["timestamp"]) <= MAX_TIMESTAMP:  # Also rejects NaN
+            raise ValueError(f"timestamp out of range: {d['timestamp']}")
         return cls(
             type=event_type,
             timestamp=float(d["timestamp"]),
@@ -91,8 +109,20 @@ class Event:
             scroll_dx=d.get("scroll_dx"), scroll_dy=d.get("scroll_dy"),
         )
 
-
-@dataclass
+    @classmethod
+    def _from_dict_fast(cls, d: Dict[str, Any]) -> "Event":
+        """Same checks as from_dict, but raises bare errors (no message formatting) on invalid input."""
+        ts = d["timestamp"]
+        if not isinstance(ts, (int, float)):
+            raise TypeError
+        if not abs(ts) <= MAX_TIMESTAMP:
+            raise ValueError
+        get = d.get
+        return cls(_TYPES_BY_VALUE[d["type"]], float(ts), get("x"), get("y"), get("button"),
+                   get("key"), get("pressed"), get("scroll_dx"), get("scroll_dy"))
+
+
+@dataclass(**_SLOTS)
 class Macro:
     name: str = "New Macro"
     events: List[Event] = field(default_factory=list)
@@ -113,12 +143,17 @@ class Macro:
             raise ValueError("Required field (events) is missing")
         if not isinstance(d["events"], list):
             raise ValueError("events must be in list format")
-        events = []
-        for i, e in enumerate(d["events"]):
-            try:
-                events.append(Event.from_dict(e))
-            except Exception as ex:
-                raise ValueError(f"Failed to load event [{i}]: {str(ex)}")
+        try:
+            # Fast path: one pass over well-formed events
+            events = [Event._from_dict_fast(e) for e in d["events"]]
+        except Exception:
+            # Slow path: validate event by event to report what is wrong and where
+            events = []
+            for i, e in enumerate(d["events"]):
+                try:
+                    events.append(Event.from_dict(e))
+                except Exception as ex:
+                    raise ValueError(f"Failed to load event [{i}]: {str(ex)}")
         return cls(
             name=d.get("name", "Untitled"),
             events=events,
@@ -129,9 +164,325 @@ class Macro:
     def duration(self) -> float:
         return self.events[-1].timestamp if self.events else 0.0
 
+    def iter_event_dicts(self) -> Iterator[Dict[str, Any]]:
+        """Yield each event's dict form lazily (see save_json)."""
+        for e in self.events:
+            yield e.to_dict()
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def save_json(macro: Macro, path: str) -> None:
+    """
+    Save a macro as JSON, streaming one event per line.
+    
+    Events are encoded and written one at a time, so the full list of
+    event dicts and the full document string are never held in memory.
+    
+    Args:
+        macro: Macro to save
+        path: Destination file path
+    """
+    with open(path, "wb") as f:
+        f.write(b'{"name":' + _json_dumps(macro.name) + b',"created_at":' + _json_dumps(macro.created_at) + b',"events":[')
+        for i, d in enumerate(macro.iter_event_dicts()):
+            f.write(b",\n" if i else b"\n")
+            f.write(_json_dumps(d))
+        f.write(b"\n]}\n")
+
+
+# === Binary Format ===
+
+EPMB_MAGIC = b"EPMB\x01"  # File signature + format version
+# type_id, present-field bits, timestamp, x, y, button string id, pressed, key string id, scroll_dx, scroll_dy
+_EPMB_RECORD = struct.Struct("<BBdiiHBHii")
+_EPMB_LEN = struct.Struct("<I")
+# Optional Event fields in present-bit order (bit 0 = x, ..., bit 6 = scroll_dy)
+_EPMB_OPTIONAL = ("x", "y", "button", "pressed", "key", "scroll_dx", "scroll_dy")
+_EPMB_INT_MIN, _EPMB_INT_MAX = -2 ** 31, 2 ** 31 - 1  # Range of the i4 coordinate/scroll fields
+
+
+def _epmb_int(e: Event, name: str) -> int:
+    """Convert an optional integer field of e for packing; raises ValueError if it can't be stored."""
+    value = getattr(e, name)
+    if value is None:
+        return 0
+    try:
+        n = int(value)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} must be an integer: {value!r}")
+    if not _EPMB_INT_MIN <= n <= _EPMB_INT_MAX:
+        raise ValueError(f"{name} is out of range for the binary format: {value!r}")
+    return n
+
+
+def save_binary(macro: Macro, path: str) -> None:
+    """
+    Save a macro in the compact .epmb binary format.
+    
+    Layout (little-endian): magic, name and created_at as u32-length-prefixed
+    UTF-8, u32 string count followed by the strings, u32 event count, then one
+    fixed-size record per event. Button and key names are stored as indices
+    into the string table; a bitmask records which optional fields are set.
+    
+    Args:
+        macro: Macro to save
+        path: Destination file path
+    """
+    string_ids: Dict[str, int] = {}
+
+    def sid(s: Optional[str], name: str) -> int:
+        if s is None:
+            return 0
+        if not isinstance(s, str):  # e.g. "key": 5 in a JSON macro
+            raise ValueError(f"{name} must be a string: {s!r}")
+        return string_ids.setdefault(s, len(string_ids))
+
+    records = bytearray(len(macro.events) * _EPMB_RECORD.size)
+    for i, e in enumerate(macro.events):
+        present = 0
+        for bit, name in enumerate(_EPMB_OPTIONAL):
+            if getattr(e, name) is not None:
+                present |= 1 << bit
+        try:
+            _EPMB_RECORD.pack_into(
+                records, i * _EPMB_RECORD.size,
+                _TYPE_IDS[e.type], present, e.timestamp, e.x or 0, e.y or 0,
+                sid(e.button, "button"), bool(e.pressed), sid(e.key, "key"), e.scroll_dx or 0, e.scroll_dy or 0,
+            )
+        except struct.error:
+            # Slow path for non-int values, e.g. "x": 10.0 loaded from JSON
+            _EPMB_RECORD.pack_into(
+                records, i * _EPMB_RECORD.size,
+                _TYPE_IDS[e.type], present, e.timestamp, _epmb_int(e, "x"), _epmb_int(e, "y"),
+                sid(e.button, "button"), bool(e.pressed), sid(e.key, "key"),
+                _epmb_int(e, "scroll_dx"), _epmb_int(e, "scroll_dy"),
+            )
+
+    def pack_str(s: str) -> bytes:
+        b = s.encode("utf-8")
+        return _EPMB_LEN.pack(len(b)) + b
+
+    with open(path, "wb") as f:
+        f.write(EPMB_MAGIC)
+        f.write(pack_str(macro.name))
+        f.write(pack_str(macro.created_at))
+        f.write(_EPMB_LEN.pack(len(string_ids)))
+        f.write(b"".join(pack_str(s) for s in string_ids))  # dicts keep insertion (= id) order
+        f.write(_EPMB_LEN.pack(len(macro.events)))
+        f.write(records)
+
+
+def load_binary(path: str) -> Macro:
+    """
+    Load a macro saved by save_binary().
+    
+    Args:
+        path: Source file path
+        
+    Returns:
+        Loaded Macro
+        
+    Raises:
+        ValueError: If the file is not a valid .epmb file
+    """
+    with open(path, "rb") as f:
+        return _parse_binary(f.read())
+
+
+def _parse_binary(data: bytes) -> Macro:
+    """Decode the contents of an .epmb file (see load_binary)."""
+    if not data.startswith(EPMB_MAGIC):
+        raise ValueError("Not an EventPlayback binary macro file")
+    view = memoryview(data)
+    pos = len(EPMB_MAGIC)
+
+    def read_len() -> int:
+        nonlocal pos
+        (n,) = _EPMB_LEN.unpack_from(view, pos)
+        pos += _EPMB_LEN.size
+        return n
+
+    def read_str() -> str:
+        nonlocal pos
+        n = read_len()
+        if pos + n > len(view):
+            raise ValueError("Truncated binary macro file")
+        s = str(view[pos:pos + n], "utf-8")
+        pos += n
+        return s
+
+    try:
+        name = read_str()
+        created_at = read_str()
+        strings = [read_str() for _ in range(read_len())]
+        count = read_len()
+        end = pos + count * _EPMB_RECORD.size
+        if end != len(view):
+            raise ValueError("Truncated binary macro file")
+        events = []
+        for type_id, present, ts, x, y, button, pressed, key, dx, dy in _EPMB_RECORD.iter_unpack(view[pos:end]):
+            if not abs(ts) <= MAX_TIMESTAMP:  # Same bound as Event.from_dict; also rejects NaN
+                raise ValueError(f"Corrupt binary macro file: timestamp out of range: {ts}")
+            events.append(Event(
+                _EVENT_TYPES[type_id], ts,
+                x=x if present & 1 else None,
+                y=y if present & 2 else None,
+                button=strings[button] if present & 4 else None,
+                pressed=bool(pressed) if present & 8 else None,
+                key=strings[key] if present & 16 else None,
+                scroll_dx=dx if present & 32 else None,
+                scroll_dy=dy if present & 64 else None,
+            ))
+    except (struct.error, IndexError) as e:
+        raise ValueError(f"Corrupt binary macro file: {e}")
+    return Macro(name=name, events=events, created_at=created_at)
+
+
+def save_macro(macro: Macro, path: str) -> None:
+    """
+    Save a macro as JSON if the path ends in .json, and in the binary format otherwise.
+    
+    Args:
+        macro: Macro to save
+        path: Destination file path; missing parent directories are created
+    """
+    dir_path = os.path.dirname(path)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path, exist_ok=True)
+    if path.lower().endswith(".json"):
+        save_json(macro, path)
+    else:
+        save_binary(macro, path)
+
+
+def load_macro(path: str) -> Macro:
+    """
+    Load a macro saved by save_macro().
+    
+    The format is detected from the file contents (the binary magic header),
+    not the extension, so a macro saved under any name can be opened again.
+    
+    Args:
+        path: Source file path
+        
+    Returns:
+        Loaded Macro
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith(EPMB_MAGIC):
+        return _parse_binary(data)
+    return Macro.from_dict(_json_loads(data))
+
 
 # === Recording ===
 
+# Mouse buttons are stored as small integer ids inside the recorder's ring buffers
+# (side buttons x1/x2 only exist on some platforms)
+_BUTTON_BY_ID = tuple(name for name in ("left", "right", "middle", "x1", "x2") if hasattr(mouse.Button, name))
+_BUTTON_IDS: Dict[Any, int] = {getattr(mouse.Button, name): i for i, name in enumerate(_BUTTON_BY_ID)}
+# Type ids resolved once for the listener callbacks
+_MOVE_ID = _TYPE_IDS[EventType.MOUSE_MOVE]
+_CLICK_ID = _TYPE_IDS[EventType.MOUSE_CLICK]
+_SCROLL_ID = _TYPE_IDS[EventType.MOUSE_SCROLL]
+_PRESS_ID = _TYPE_IDS[EventType.KEY_PRESS]
+_RELEASE_ID = _TYPE_IDS[EventType.KEY_RELEASE]
+# Listener callbacks store raw clock values; the recording start is subtracted once in stop()
+_perf_counter = time.perf_counter
+# pynput key object -> interned key name (only touched by the keyboard listener thread)
+_KEY_CACHE: Dict[Any, str] = {}
+
+
+class _RingBuf:
+    """
+    Single-producer/single-consumer ring buffer of fixed-size event records.
+
+    The producer packs a record into the slot at ``head % capacity`` and then
+    publishes it by advancing ``head``; the consumer reads ``tail``..``head``.
+    Each index is written by one side only, so neither side takes a lock.
+    Rather than overwrite unread records, the producer doubles the ring when full.
+    """
+    # type_id:u1, ts:f8, x:i4, y:i4, button_id:u1, pressed:u1, key_id:u2, scroll_dx:i4, scroll_dy:i4
+    # Packed to 29 bytes per event (a List[Event] costs several hundred). Scroll deltas are i4 because
+    # high-resolution wheels and touchpads can exceed the i2 range
+    RECORD = struct.Struct("<BdiiBBHii")
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self._capacity: int = capacity
+        self._data: bytearray = bytearray(capacity * self.RECORD.size)
+        self.head: int = 0
+        self.tail: int = 0
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    def push(self, *record: Any) -> None:
+        head = self.head
+        if head - self.tail == self._capacity:
+            self._grow()
+        self.RECORD.pack_into(self._data, (head % self._capacity) * self.RECORD.size, *record)
+        self.head = head + 1  # Publish only after the slot is fully written
+
+    def replace_last(self, *record: Any) -> bool:
+        """Overwrite the newest record if it is still unread (producer side only)."""
+        head = self.head
+        if head == self.tail:
+            return False
+        self.RECORD.pack_into(self._data, ((head - 1) % self._capacity) * self.RECORD.size, *record)
+        return True
+
+    def drain(self) -> List[Tuple[Any, ...]]:
+        """
+        Consume all published records in order.
+        
+        Safe to call while the producer is still pushing (e.g. a listener thread
+        that outlived its join timeout): head is read before the buffer, and the
+        buffer is read once, with its capacity derived from its length. _grow()
+        copies rather than moves records and swaps _data in a single store, so
+        whichever buffer is seen holds every record up to that head.
+        Records published after head was read are left for a later drain.
+        """
+        head, tail = self.head, self.tail
+        data = self._data
+        size = self.RECORD.size
+        cap = len(data) // size  # Not self._capacity, which _grow() updates separately
+        view = memoryview(data)
+        start, end = tail % cap, head % cap
+        if head == tail:
+            chunks = []
+        elif start < end:
+            chunks = [view[start * size:end * size]]
+        else:  # Unread region wraps around the end of the buffer
+            chunks = [view[start * size:], view[:end * size]]
+        records = [r for chunk in chunks for r in self.RECORD.iter_unpack(chunk)]
+        self.tail = head
+        return records
+
+    def _grow(self) -> None:
+        old, old_cap = self._data, self._capacity
+        new_cap = old_cap * 2
+        size = self.RECORD.size
+        new = bytearray(new_cap * size)
+        for i in range(self.tail, self.head):
+            src, dst = (i % old_cap) * size, (i % new_cap) * size
+            new[dst:dst + size] = old[src:src + size]
+        self._data = new  # Publish the new buffer before its capacity; drain() only relies on _data
+        self._capacity = new_cap
+
+
 class Recorder:
     """
     Record mouse and keyboard input events.
@@ -143,24 +494,41 @@ class Recorder:
         events = recorder.stop()
     """
     INTERVAL = 0.02  # Mouse movement throttling interval (seconds) - Record at 20ms intervals for performance optimization
+    COALESCE_INTERVAL = 0.04  # Move coalescing window (seconds) - Moves within this window of a run's first move overwrite its latest sample
     EXCLUDED_HOTKEYS = ("f9", "f10", "escape")  # Hotkey exclusion list (not recorded)
 
-    def __init__(self) -> None:
+    def __init__(self, coalesce_moves: bool = True) -> None:
         self._events: List[Event] = []
         self._start_time: float = 0.0
         self._recording: bool = False
         self._last_move: float = 0.0
+        # Move coalescing state (only touched by the mouse listener thread)
+        self.coalesce_moves: bool = coalesce_moves
+        self._move_anchor: float = 0.0
+        self._move_head: int = -1
+        self._move_kb_head: int = -1
         self._mouse_listener: Optional[Any] = None
         self._kb_listener: Optional[Any] = None
-        self._lock: threading.Lock = threading.Lock()
-        self.on_event: Optional[Callable[[Event], None]] = None
+        # One ring per listener thread keeps each ring single-producer
+        self._mouse_ring: _RingBuf = _RingBuf()
+        self._kb_ring: _RingBuf = _RingBuf()
+        # Key name intern table (only touched by the keyboard listener thread)
+        self._key_ids: Dict[str, int] = {}
+        self._key_names: List[str] = []
+        # Called from listener threads with the type of each new event (Event objects are built at stop())
+        self.on_event: Optional[Callable[[EventType], None]] = None
 
     def start(self) -> None:
         if self._recording:
             return
         self._events.clear()
+        self._mouse_ring = _RingBuf()
+        self._kb_ring = _RingBuf()
+        self._key_ids.clear()
+        self._key_names.clear()
         self._start_time = time.perf_counter()
-        self._last_move = 0.0
+        self._last_move = self._start_time
+        self._move_head = -1
         self._recording = True
 
         self._mouse_listener = mouse.Listener(
@@ -191,61 +559,96 @@ class Recorder:
                 self._kb_listener.join(timeout=0.5)
             except Exception as e:
                 logger.error(f"Keyboard listener stop error: {e}", exc_info=True)
+        for listener in (self._mouse_listener, self._kb_listener):
+            if listener and listener.is_alive():
+                logger.warning("Input listener is taking too long to stop")
+        # A listener that outlived its join may still push; _RingBuf.drain() tolerates a concurrent producer
+        self._events = self._drain()
         return self._events.copy()
 
     def is_recording(self) -> bool:
         return self._recording
 
     def event_count(self) -> int:
-        with self._lock:
-            return len(self._events)
-
-    def _ts(self) -> float:
-        return time.perf_counter() - self._start_time
+        return len(self._mouse_ring) + len(self._kb_ring)
 
-    def _add(self, event: Event) -> None:
-        with self._lock:
-            self._events.append(event)
+    def _add(self, ring: _RingBuf, record: Tuple[Any, ...]) -> None:
+        ring.push(*record)
         if self.on_event:
-            self.on_event(event)
+            self.on_event(_EVENT_TYPES[record[0]])
+
+    def _drain(self) -> List[Event]:
+        """Merge both rings by timestamp and build Event objects once, after recording."""
+        records = heapq.merge(self._mouse_ring.drain(), self._kb_ring.drain(), key=itemgetter(1))
+        return [self._to_event(r) for r in records]
+
+    def _to_event(self, record: Tuple[Any, ...]) -> Event:
+        type_id, t, x, y, button_id, pressed, key_id, dx, dy = record
+        t -= self._start_time  # Records hold raw perf_counter() values
+        event_type = _EVENT_TYPES[type_id]
+        if event_type is EventType.MOUSE_MOVE:
+            return Event(event_type, t, x=x, y=y)
+        if event_type is EventType.MOUSE_CLICK:
+            return Event(event_type, t, x=x, y=y, button=_BUTTON_BY_ID[button_id], pressed=bool(pressed))
+        if event_type is EventType.MOUSE_SCROLL:
+            return Event(event_type, t, x=x, y=y, scroll_dx=dx, scroll_dy=dy)
+        return Event(event_type, t, key=self._key_names[key_id], pressed=bool(pressed))
+
+    def _key_id(self, name: str) -> int:
+        key_id = self._key_ids.get(name)
+        if key_id is None:
+            key_id = self._key_ids[name] = len(self._key_names)
+            self._key_names.append(name)
+        return key_id
 
     def _on_move(self, x: float, y: float) -> None:
         if not self._recording:
             return
-        t = self._ts()
+        t = _perf_counter()
         if t - self._last_move < self.INTERVAL:
             return
         self._last_move = t
-        self._add(Event(EventType.MOUSE_MOVE, t, x=int(x), y=int(y)))
+        ring, kb_ring = self._mouse_ring, self._kb_ring
+        record = (_MOVE_ID, t, int(x), int(y), 0, 0, 0, 0, 0)
+        # Still inside a run of moves (no click/scroll/key since): update its latest sample in place
+        if (self.coalesce_moves and ring.head == self._move_head and kb_ring.head == self._move_kb_head
+                and t - self._move_anchor < self.COALESCE_INTERVAL and ring.replace_last(*record)):
+            return
+        self._add(ring, record)
+        self._move_anchor = t
+        self._move_head = ring.head
+        self._move_kb_head = kb_ring.head
 
     def _on_click(self, x: float, y: float, button: Any, pressed: bool) -> None:
         if not self._recording:
             return
-        btn = "left" if button == mouse.Button.left else "right" if button == mouse.Button.right else "middle"
-        self._add(Event(EventType.MOUSE_CLICK, self._ts(), x=int(x), y=int(y), button=btn, pressed=pressed))
+        btn = _BUTTON_IDS.get(button)
+        if btn is None:  # Unknown button - not recordable
+            return
+        self._add(self._mouse_ring, (_CLICK_ID, _perf_counter(), int(x), int(y), btn, pressed, 0, 0, 0))
 
     def _on_scroll(self, x: float, y: float, dx: int, dy: int) -> None:
         if not self._recording:
             return
-        self._add(Event(EventType.MOUSE_SCROLL, self._ts(), x=int(x), y=int(y), scroll_dx=dx, scroll_dy=dy))
+        self._add(self._mouse_ring, (_SCROLL_ID, _perf_counter(), int(x), int(y), 0, 0, 0, int(dx), int(dy)))
 
     def _on_press(self, key: Any) -> None:
         if not self._recording:
             return
         name = self._key_name(key)
         if name and name not in self.EXCLUDED_HOTKEYS:
-            self._add(Event(EventType.KEY_PRESS, self._ts(), key=name, pressed=True))
+            self._add(self._kb_ring, (_PRESS_ID, _perf_counter(), 0, 0, 0, 1, self._key_id(name), 0, 0))
 
     def _on_release(self, key: Any) -> None:
         if not self._recording:
             return
         name = self._key_name(key)
         if name and name not in self.EXCLUDED_HOTKEYS:
-            self._add(Event(EventType.KEY_RELEASE, self._ts(), key=name, pressed=False))
+            self._add(self._kb_ring, (_RELEASE_ID, _perf_counter(), 0, 0, 0, 0, self._key_id(name), 0, 0))
 
     def _key_name(self, key) -> Optional[str]:
         """
-        Convert pynput Key object to string name.
+        Convert pynput Key object to string name (cached and interned per key).
         
         Args:
             key: pynput Key object
@@ -253,6 +656,15 @@ class Recorder:
         Returns:
             Key name string (e.g., "a", "f1", "space"), None if conversion fails
         """
+        name = _KEY_CACHE.get(key)
+        if name is None:
+            name = self._resolve_key_name(key)
+            if name is not None:
+                name = _KEY_CACHE[key] = sys.intern(name)
+        return name
+
+    @staticmethod
+    def _resolve_key_name(key) -> Optional[str]:
         # Normal character keys (a-z, 0-9, etc.)
         try:
             if key.char is not None:
@@ -268,6 +680,66 @@ class Recorder:
 
 # === Playback ===
 
+_BUTTONS: Dict[str, Any] = {name: getattr(MouseButton, name) for name in _BUTTON_BY_ID}
+
+
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [("dx", ctypes.c_long), ("dy", ctypes.c_long), ("mouseData", ctypes.c_ulong),
+                ("dwFlags", ctypes.c_ulong), ("time", ctypes.c_ulong), ("dwExtraInfo", ctypes.c_size_t)]
+
+
+class _INPUT(ctypes.Structure):
+    # MOUSEINPUT is the largest member of the Win32 INPUT union, so the size matches
+    _fields_ = [("type", ctypes.c_ulong), ("mi", _MOUSEINPUT)]
+
+
+class _WinMouseMover:
+    """
+    Move the cursor with a direct user32.SendInput call (Windows only).
+    
+    Skips pynput's Python-level position setter on the playback hot path: one
+    INPUT structure is built up front and only its coordinates change per move.
+    Coordinates are normalized to the 0-65535 virtual-desktop range ahead of
+    time via normalize(), so move() is two stores and one call.
+    """
+    INPUT_MOUSE = 0
+    MOUSEEVENTF_MOVE = 0x0001
+    MOUSEEVENTF_VIRTUALDESK = 0x4000
+    MOUSEEVENTF_ABSOLUTE = 0x8000
+    SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN, SM_CYVIRTUALSCREEN = 76, 77, 78, 79
+
+    def __init__(self) -> None:
+        self._user32 = ctypes.windll.user32  # AttributeError on non-Windows platforms
+        self._send = self._user32.SendInput
+        self._input = _INPUT(type=self.INPUT_MOUSE)
+        self._input.mi.dwFlags = self.MOUSEEVENTF_MOVE | self.MOUSEEVENTF_ABSOLUTE | self.MOUSEEVENTF_VIRTUALDESK
+        self._mi = self._input.mi
+        self._ref = ctypes.byref(self._input)
+        self._size = ctypes.sizeof(self._input)
+        self._left = self._top = 0
+        self._width = self._height = 1
+        self.update_metrics()
+
+    def update_metrics(self) -> None:
+        """Re-read the virtual desktop bounds (monitors may change between playbacks)."""
+        metric = self._user32.GetSystemMetrics
+        self._left, self._top = metric(self.SM_XVIRTUALSCREEN), metric(self.SM_YVIRTUALSCREEN)
+        self._width = max(1, metric(self.SM_CXVIRTUALSCREEN))
+        self._height = max(1, metric(self.SM_CYVIRTUALSCREEN))
+
+    def normalize(self, x: float, y: float) -> Tuple[int, int]:
+        """Convert screen pixels to absolute SendInput coordinates (rounded up so they map back to the same pixel)."""
+        x, y = int(x), int(y)  # Macros loaded from JSON may hold floats; the INPUT fields are c_long
+        return (-(-(x - self._left) * 65536 // self._width),
+                -(-(y - self._top) * 65536 // self._height))
+
+    def move(self, dx: int, dy: int) -> None:
+        mi = self._mi
+        mi.dx = dx
+        mi.dy = dy
+        self._send(1, self._ref, self._size)
+
+
 class Player:
     """
     Play back recorded mouse and keyboard events.
@@ -280,21 +752,51 @@ class Player:
     """
     # Valid special characters for single character keys
     VALID_SPECIAL_CHARS = "!@#$%^&*()_+-=[]{}|;:'\",.<>?/~`"
-    
+    _VALID_SPECIAL = frozenset(VALID_SPECIAL_CHARS)
+    # Named keys for _to_key (built once at import)
+    _SPECIAL_KEYS: Dict[str, Key] = {
+        "space": Key.space, "enter": Key.enter, "tab": Key.tab,
+        "backspace": Key.backspace, "delete": Key.delete,
+        "escape": Key.esc, "shift": Key.shift, "shift_l": Key.shift_l,
+        "shift_r": Key.shift_r, "ctrl": Key.ctrl, "ctrl_l": Key.ctrl_l,
+        "ctrl_r": Key.ctrl_r, "alt": Key.alt, "alt_l": Key.alt_l,
+        "alt_r": Key.alt_r, "alt_gr": Key.alt_gr,
+        "caps_lock": Key.caps_lock, "up": Key.up, "down": Key.down,
+        "left": Key.left, "right": Key.right, "home": Key.home,
+        "end": Key.end, "page_up": Key.page_up, "page_down": Key.page_down,
+        "insert": Key.insert, "f1": Key.f1, "f2": Key.f2, "f3": Key.f3,
+        "f4": Key.f4, "f5": Key.f5, "f6": Key.f6, "f7": Key.f7,
+        "f8": Key.f8, "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
+    }
+    SPIN_THRESHOLD_NS = 2_000_000  # Waits longer than this sleep first (nanoseconds) - OS sleep has ~1ms jitter
+    SPIN_MARGIN_NS = 1_000_000  # Time left to busy-wait after the coarse sleep (nanoseconds)
+    TIMER_RESOLUTION_MS = 1  # Windows timer resolution requested while playing (milliseconds) - Default ~15.6ms tick makes sleeps overshoot
+    THREAD_PRIORITY_HIGHEST = 2  # Windows playback thread priority (TIME_CRITICAL would let the spin-wait starve input handling)
+
     def __init__(self) -> None:
         self._events: List[Event] = []
-        self._playing: bool = False
-        self._stop_flag: bool = False
+        self._plan: List[Tuple[int, bool, Callable[..., Any], Tuple[Any, ...]]] = []
+        self._plan_ts: List[int] = []  # Step target times (nanoseconds), for bisect
+        self._run_end: List[int] = []  # Index of the last move in the run of moves starting at each step
+        self._playing: bool = False  # Plain attribute: reads are atomic, so is_playing() needs no lock
+        self._stop_event: threading.Event = threading.Event()
         self._loop_count: int = 1
         self._thread: Optional[threading.Thread] = None
-        self._lock: threading.Lock = threading.Lock()
-        self._mouse: MouseController = MouseController()
-        self._kb: KeyboardController = KeyboardController()
+        self._lock: threading.Lock = threading.Lock()  # Guards the start() check-and-set only
+        # Input controllers are created on first use (see _ensure_controllers)
+        self._mouse: Optional[Any] = None
+        self._kb: Optional[Any] = None
+        self._win_mover: Optional[_WinMouseMover] = None
         self.on_complete: Optional[Callable[[], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
 
     def set_events(self, events: List[Event]) -> None:
         self._events = events.copy()
+        if self._events:
+            self._ensure_controllers()
+        self._plan = self._compile_plan(self._events)
+        self._plan_ts = list(map(itemgetter(0), self._plan))
+        self._run_end = self._move_runs(self._plan)
 
     def set_loop(self, count: int) -> None:
         self._loop_count = max(0, count)
@@ -304,109 +806,170 @@ class Player:
             if self._playing or not self._events:
                 return
             self._playing = True
-            self._stop_flag = False
+            self._stop_event.clear()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
 
     def stop(self) -> None:
-        with self._lock:
-            if not self._playing:
-                return
-            self._stop_flag = True
+        if not self._playing:
+            return
+        self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=1.0)
             if self._thread.is_alive():
                 # Warn if thread is still alive after timeout
                 logger.warning("Playback thread is taking too long to stop")
-        with self._lock:
-            self._playing = False
+        self._playing = False
 
     def is_playing(self) -> bool:
-        with self._lock:
-            return self._playing
+        return self._playing
 
     def _run(self) -> None:
+        precise = self._begin_precise_timing()
         loop = 0
-        while not self._stop_flag:
-            loop += 1
-            self._play_once()
-            if self._loop_count > 0 and loop >= self._loop_count:
-                break
-        with self._lock:
-            self._playing = False
-        if self.on_complete and not self._stop_flag:
+        stopped = self._stop_event.is_set
+        try:
+            while not stopped():
+                loop += 1
+                self._play_once()
+                if self._loop_count > 0 and loop >= self._loop_count:
+                    break
+        finally:
+            if precise:
+                self._end_precise_timing()
+        self._playing = False
+        if self.on_complete and not stopped():
             self.on_complete()
 
-    def _play_once(self) -> None:
-        if not self._events:
-            return
-        start = time.perf_counter()
-        for event in self._events:
-            if self._stop_flag:
-                break
-            wait = start + event.timestamp - time.perf_counter()
-            if wait > 0:
-                time.sleep(wait)
-            self._play_event(event)
-
-    def _play_event(self, e: Event) -> None:
-        """Play a single event."""
+    def _begin_precise_timing(self) -> bool:
+        """
+        Raise the Windows timer resolution and this thread's priority for playback.
+        
+        Returns:
+            True if the timer resolution was raised (must be paired with _end_precise_timing)
+        """
         try:
-            if e.type == EventType.MOUSE_MOVE:
-                self._play_mouse_move(e)
-            elif e.type == EventType.MOUSE_CLICK:
-                self._play_mouse_click(e)
-            elif e.type == EventType.MOUSE_SCROLL:
-                self._play_mouse_scroll(e)
-            elif e.type == EventType.KEY_PRESS:
-                self._play_key_press(e)
-            elif e.type == EventType.KEY_RELEASE:
-                self._play_key_release(e)
-        except Exception as ex:
-            error_msg = f"Playback error: {ex}"
-            logger.error(error_msg, exc_info=True)
-            if self.on_error:
-                self.on_error(error_msg)
-
-    def _play_mouse_move(self, e: Event) -> None:
-        """Play mouse move event."""
-        if e.x is not None and e.y is not None:
-            self._mouse.position = (e.x, e.y)
-
-    def _play_mouse_click(self, e: Event) -> None:
-        """Play mouse click event."""
-        if e.button and e.pressed is not None and e.x is not None and e.y is not None:
-            btn = MouseButton.left if e.button == "left" else MouseButton.right if e.button == "right" else MouseButton.middle
-            if e.pressed:
-                self._mouse.press(btn)
-            else:
-                self._mouse.release(btn)
-
-    def _play_mouse_scroll(self, e: Event) -> None:
-        """Play mouse scroll event."""
-        if e.x is not None and e.y is not None:
-            if e.scroll_dy:
-                self._mouse.scroll(0, e.scroll_dy)
-            if e.scroll_dx:
-                self._mouse.scroll(e.scroll_dx, 0)
-
-    def _play_key_press(self, e: Event) -> None:
-        """Play key press event."""
-        if e.key is not None:
-            key = self._to_key(e.key)
-            if key is not None:
-                self._kb.press(key)
-
-    def _play_key_release(self, e: Event) -> None:
-        """Play key release event."""
-        if e.key is not None:
-            key = self._to_key(e.key)
-            if key is not None:
-                self._kb.release(key)
-
-    def _to_key(self, name: str) -> Union[Key, str, None]:
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), self.THREAD_PRIORITY_HIGHEST)
+            return ctypes.windll.winmm.timeBeginPeriod(self.TIMER_RESOLUTION_MS) == 0  # TIMERR_NOERROR
+        except Exception:
+            return False  # Not on Windows
+
+    def _end_precise_timing(self) -> None:
+        try:
+            ctypes.windll.winmm.timeEndPeriod(self.TIMER_RESOLUTION_MS)
+        except Exception as e:
+            logger.error(f"Timer resolution restore error: {e}", exc_info=True)
+
+    def _play_once(self) -> None:
+        plan, plan_ts, run_end = self._plan, self._plan_ts, self._run_end
+        n = len(plan)
+        pc_ns, wait_until, stopped = time.perf_counter_ns, self._wait_until, self._stop_event.is_set
+        start = pc_ns()
+        i = 0
+        while i < n and not stopped():
+            if wait_until(start + plan_ts[i]):
+                break  # Stopped while waiting
+            # Behind schedule: jump to the newest already-due move of this run (skipped moves are superseded)
+            end = run_end[i]
+            if end > i:
+                i = bisect_right(plan_ts, pc_ns() - start, i, end + 1) - 1
+            _, _, fn, args = plan[i]
+            try:
+                fn(*args)
+            except Exception as ex:
+                error_msg = f"Playback error: {ex}"
+                logger.error(error_msg, exc_info=True)
+                if self.on_error:
+                    self.on_error(error_msg)
+            i += 1
+
+    def _wait_until(self, target_ns: int, _pc_ns: Callable[[], int] = time.perf_counter_ns) -> bool:
+        """
+        Sleep coarsely, then spin the last stretch for sub-millisecond accuracy.
+        
+        Returns:
+            True if stop() was requested during the wait
+        """
+        remaining = target_ns - _pc_ns()
+        if remaining > self.SPIN_THRESHOLD_NS:
+            # Waiting on the stop event lets stop() interrupt long gaps between events
+            if self._stop_event.wait((remaining - self.SPIN_MARGIN_NS) / 1e9):
+                return True
+        while _pc_ns() < target_ns:
+            pass
+        return False
+
+    @staticmethod
+    def _move_runs(plan: List[Tuple[int, bool, Callable[..., Any], Tuple[Any, ...]]]) -> List[int]:
+        """For each step, the index of the last move in the run of consecutive moves it starts (itself otherwise)."""
+        run_end = list(range(len(plan)))
+        for i in range(len(plan) - 2, -1, -1):
+            if plan[i][1] and plan[i + 1][1]:
+                run_end[i] = run_end[i + 1]
+        return run_end
+
+    def _ensure_controllers(self) -> None:
+        """Create the pynput input controllers on first use."""
+        if self._mouse is None:
+            from pynput.mouse import Controller as MouseController
+            self._mouse = MouseController()
+        if self._kb is None:
+            from pynput.keyboard import Controller as KeyboardController
+            self._kb = KeyboardController()
+        if self._win_mover is None and sys.platform == "win32":
+            try:
+                self._win_mover = _WinMouseMover()
+            except Exception as e:
+                logger.warning(f"SendInput unavailable, using pynput for mouse moves: {e}")
+
+    def _compile_plan(self, events: List[Event]) -> List[Tuple[int, bool, Callable[..., Any], Tuple[Any, ...]]]:
         """
-        Convert key name string to pynput Key object.
+        Resolve events into ready-to-call playback steps once, ahead of playback.
+        
+        Args:
+            events: Recorded events in timestamp order
+            
+        Returns:
+            List of (target_ns, is_move, callable, args) steps. Events that cannot
+            be played (missing fields, unknown keys) are dropped here.
+        """
+        plan = []
+        m, kb, mover = self._mouse, self._kb, self._win_mover
+        if mover is not None:
+            mover.update_metrics()
+        for e in events:
+            t = int(e.timestamp * 1e9)
+            if e.type is EventType.MOUSE_MOVE:
+                if e.x is not None and e.y is not None:
+                    if mover is not None:
+                        plan.append((t, True, mover.move, mover.normalize(e.x, e.y)))
+                    else:
+                        plan.append((t, True, setattr, (m, "position", (e.x, e.y))))
+            elif e.type is EventType.MOUSE_CLICK:
+                if e.button and e.pressed is not None and e.x is not None and e.y is not None:
+                    btn = _BUTTONS.get(e.button)
+                    if btn is None:
+                        logger.warning(f"Unknown mouse button '{e.button}' will be ignored")
+                        continue
+                    plan.append((t, False, m.press if e.pressed else m.release, (btn,)))
+            elif e.type is EventType.MOUSE_SCROLL:
+                if e.x is not None and e.y is not None:
+                    if e.scroll_dy:
+                        plan.append((t, False, m.scroll, (0, e.scroll_dy)))
+                    if e.scroll_dx:
+                        plan.append((t, False, m.scroll, (e.scroll_dx, 0)))
+            elif e.key is not None:
+                key = self._to_key(e.key)
+                if key is not None:
+                    plan.append((t, False, kb.press if e.type is EventType.KEY_PRESS else kb.release, (key,)))
+        return plan
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _to_key(cls, name: str) -> Union[Key, str, None]:
+        """
+        Convert key name string to pynput Key object (results are cached per name).
         
         Args:
             name: Key name string (e.g., "a", "space", "f1")
@@ -417,25 +980,11 @@ class Player:
         if name is None:
             return None
         name_lower = name.lower()
-        special = {
-            "space": Key.space, "enter": Key.enter, "tab": Key.tab,
-            "backspace": Key.backspace, "delete": Key.delete,
-            "escape": Key.esc, "shift": Key.shift, "shift_l": Key.shift_l,
-            "shift_r": Key.shift_r, "ctrl": Key.ctrl, "ctrl_l": Key.ctrl_l,
-            "ctrl_r": Key.ctrl_r, "alt": Key.alt, "alt_l": Key.alt_l,
-            "alt_r": Key.alt_r, "alt_gr": Key.alt_gr,
-            "caps_lock": Key.caps_lock, "up": Key.up, "down": Key.down,
-            "left": Key.left, "right": Key.right, "home": Key.home,
-            "end": Key.end, "page_up": Key.page_up, "page_down": Key.page_down,
-            "insert": Key.insert, "f1": Key.f1, "f2": Key.f2, "f3": Key.f3,
-            "f4": Key.f4, "f5": Key.f5, "f6": Key.f6, "f7": Key.f7,
-            "f8": Key.f8, "f9": Key.f9, "f10": Key.f10, "f11": Key.f11, "f12": Key.f12,
-        }
-        result = special.get(name_lower)
+        result = cls._SPECIAL_KEYS.get(name_lower)
         if result is not None:
             return result
         # Normal character keys (single alphanumeric or special character)
-        if len(name_lower) == 1 and (name_lower.isalnum() or name_lower in self.VALID_SPECIAL_CHARS):
+        if len(name_lower) == 1 and (name_lower.isalnum() or name_lower in cls._VALID_SPECIAL):
             return name_lower
         # Invalid key name - log warning and return None
         logger.warning(f"Unknown key name '{name}' will be ignored")
@@ -453,6 +1002,8 @@ class App(ctk.CTk):
     COUNTDOWN_SECONDS = 3  # Countdown time (seconds) - Wait time before starting recording/playback
     BLINK_INTERVAL_MS = 500  # UI blink interval (milliseconds) - Blink speed for status display
     TOAST_DURATION_MS = 2000  # Toast message display time (milliseconds) - Display duration for notification messages
+    UI_POLL_MS = 20  # UI queue drain interval (milliseconds) - Upper bound on hotkey and playback callback latency
+    IO_POLL_MS = 50  # File I/O completion check interval (milliseconds) - Delay before save/load results are shown
 
     COLORS = {
         "idle": "#2b2b2b",
@@ -460,6 +1011,19 @@ class App(ctk.CTk):
         "recording": "#e74c3c",
         "playing": "#27ae60",
     }
+    _BLINK_KEY = ("idle", "countdown", "recording", "playing")  # COLORS key per state id
+
+    # Button configurations per state, as (rec_btn, stop_btn, play_btn); None = depends on whether events exist
+    _BTN_DISABLED = {"state": "disabled", "fg_color": "#7f8c8d"}
+    _BTN_STOP_ACTIVE = {"state": "normal", "fg_color": "#e74c3c"}
+    _BTN_PLAY_READY = {"state": "normal", "fg_color": "#2980b9"}
+    _STATE_BUTTON_CONFIG = {
+        STATE_IDLE: ({"state": "normal", "fg_color": "#c0392b"}, _BTN_DISABLED, None),
+        STATE_COUNTDOWN: (_BTN_DISABLED, _BTN_STOP_ACTIVE, _BTN_DISABLED),
+        STATE_RECORDING: (_BTN_DISABLED, _BTN_STOP_ACTIVE, _BTN_DISABLED),
+        STATE_PLAYING: (_BTN_DISABLED, _BTN_STOP_ACTIVE, _BTN_DISABLED),
+    }
+    _STATUS_TEXT = {STATE_IDLE: "Idle", STATE_RECORDING: "● Recording", STATE_PLAYING: "▶ Playing"}
 
     def __init__(self) -> None:
         super().__init__()
@@ -467,30 +1031,59 @@ class App(ctk.CTk):
         self.title(title)
         self.geometry("420x100")
         self.resizable(False, False)
-        self.configure(fg_color=self.COLORS["idle"])
-        self.attributes("-topmost", True)
+        # Background colors resolved once per state id for the blink loop
+        self._bg_on: Tuple[str, ...] = tuple(self.COLORS[key] for key in self._BLINK_KEY)
+        self._bg_off: str = self.COLORS["idle"]
+        self.configure(fg_color=self._bg_off)
+        self._last_bg: str = self._bg_off
+        # Apply topmost once the event loop is idle so the window maps at its final size first
+        self.after_idle(lambda: self.attributes("-topmost", True))
 
         self.recorder = Recorder()
         self.player = Player()
         self.macro = Macro()
 
         self._state: int = self.STATE_IDLE
-        self._countdown: int = 0
+        self._countdown_deadline: float = 0.0  # time.monotonic() at which the countdown ends
         self._blink_on: bool = True
         self._blink_id: Optional[str] = None
         self._countdown_id: Optional[str] = None
         self._pending: Optional[str] = None
+        # Last (state, has_events) rendered by _update_state, to skip no-op widget reconfiguration
+        self._last_rendered_state: Optional[int] = None
+        self._last_has_events: Optional[bool] = None
+        # Config dict last applied to each of (rec_btn, stop_btn, play_btn); the configs are shared constants
+        self._applied_btn_cfg: List[Optional[Dict[str, str]]] = [None, None, None]
+        self._info_pending: bool = False  # An info refresh is already queued (see _schedule_info_update)
+        self._last_info_text: str = ""  # Text currently shown by info_label
+        self._loop_count: int = 1  # Parsed loop_entry value, kept current by _validate_loop_input
+        # Handlers queued by the hotkey listener and playback threads, run on the Tk thread by _drain_ui_queue
+        self._ui_q: "queue.SimpleQueue[Callable[[], None]]" = queue.SimpleQueue()
+        self._hotkey_handlers: Dict[Any, Callable[[], None]] = {}
+        self._hotkey_listener: Optional[pynput_kb.Listener] = None
+        self._ui_poll_id: Optional[str] = None
+        self._toast_after_id: Optional[str] = None
+        # Saving/loading runs off the Tk thread so large macros don't freeze the window
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="macro-io")
+        self._loads_pending: int = 0  # Loads submitted but not yet applied; recording/playback waits for them
 
         self._setup_ui()
         self._setup_hotkeys()
+        self._ui_poll_id = self.after(self.UI_POLL_MS, self._drain_ui_queue)
 
-        self.recorder.on_event = lambda e: self.after(0, self._update_info)
-        self.player.on_complete = lambda: self.after(0, self._on_complete)
-        self.player.on_error = lambda msg: self.after(0, lambda: self._toast(msg))
+        self.recorder.on_event = lambda event_type: self._schedule_info_update()
+        # Called on the playback thread; the handlers run on the Tk thread via the UI queue
+        self.player.on_complete = lambda: self._ui_q.put_nowait(self._on_complete)
+        self.player.on_error = lambda msg: self._ui_q.put_nowait(partial(self._toast, msg))
 
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     def _setup_ui(self) -> None:
+        # Fonts (each CTkFont creates a Tk font, so build the distinct ones once and share them)
+        self._font_btn = ctk.CTkFont(size=13, weight="bold")
+        self._font_small = ctk.CTkFont(size=12)
+        self._font_status = ctk.CTkFont(size=16, weight="bold")
+
         # Main frame
         self.main_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.main_frame.pack(fill="both", expand=True, padx=8, pady=8)
@@ -500,19 +1093,19 @@ class App(ctk.CTk):
         btn_frame.pack(fill="x", pady=(0, 8))
 
         self.rec_btn = ctk.CTkButton(btn_frame, text="● Record", width=80, height=36,
-                                      font=ctk.CTkFont(size=13, weight="bold"),
+                                      font=self._font_btn,
                                       fg_color="#c0392b", hover_color="#e74c3c",
                                       command=self._on_rec)
         self.rec_btn.pack(side="left", padx=(0, 4))
 
         self.stop_btn = ctk.CTkButton(btn_frame, text="■ Stop", width=80, height=36,
-                                       font=ctk.CTkFont(size=13, weight="bold"),
+                                       font=self._font_btn,
                                        fg_color="#7f8c8d", hover_color="#95a5a6",
                                        command=self._on_stop, state="disabled")
         self.stop_btn.pack(side="left", padx=(0, 4))
 
         self.play_btn = ctk.CTkButton(btn_frame, text="▶ Play", width=80, height=36,
-                                       font=ctk.CTkFont(size=13, weight="bold"),
+                                       font=self._font_btn,
                                        fg_color="#2980b9", hover_color="#3498db",
                                        command=self._on_play)
         self.play_btn.pack(side="left", padx=(0, 8))
@@ -520,11 +1113,13 @@ class App(ctk.CTk):
         # Loop
         loop_frame = ctk.CTkFrame(btn_frame, fg_color="transparent")
         loop_frame.pack(side="left", padx=(4, 0))
-        ctk.CTkLabel(loop_frame, text="×", font=ctk.CTkFont(size=12), text_color="#888").pack(side="left")
-        self.loop_var = ctk.StringVar(value="1")
+        ctk.CTkLabel(loop_frame, text="×", font=self._font_small, text_color="#888").pack(side="left")
+        self.loop_var = ctk.StringVar(value=str(self._loop_count))
         self.loop_entry = ctk.CTkEntry(loop_frame, textvariable=self.loop_var, width=36, height=28,
-                                        font=ctk.CTkFont(size=12), justify="center",
-                                        fg_color="#3a3a3a", border_color="#555", text_color="white")
+                                        font=self._font_small, justify="center",
+                                        fg_color="#3a3a3a", border_color="#555", text_color="white",
+                                        validate="key",
+                                        validatecommand=(self.register(self._validate_loop_input), "%P"))
         self.loop_entry.pack(side="left", padx=4)
 
         # File
@@ -540,19 +1135,37 @@ class App(ctk.CTk):
         status_frame.pack(fill="x")
 
         self.status_label = ctk.CTkLabel(status_frame, text="Idle",
-                                          font=ctk.CTkFont(size=16, weight="bold"),
+                                          font=self._font_status,
                                           text_color="white")
         self.status_label.pack(side="left")
 
         self.info_label = ctk.CTkLabel(status_frame, text="0 events | 0.0s",
-                                        font=ctk.CTkFont(size=12), text_color="#aaa")
+                                        font=self._font_small, text_color="#aaa")
         self.info_label.pack(side="right")
 
     def _setup_hotkeys(self) -> None:
-        # Hotkeys are called from outside the main thread, so update GUI via after()
-        keyboard.add_hotkey("f9", lambda: self.after(0, self._on_rec))
-        keyboard.add_hotkey("f10", lambda: self.after(0, self._on_play))
-        keyboard.add_hotkey("escape", lambda: self.after(0, self._on_stop))
+        self._hotkey_handlers = {Key.f9: self._on_rec, Key.f10: self._on_play, Key.esc: self._on_stop}
+        self._hotkey_listener = pynput_kb.Listener(on_press=self._on_hotkey_press)
+        self._hotkey_listener.start()
+
+    def _on_hotkey_press(self, key: Any) -> None:
+        # Runs on the listener's hook thread: only enqueue, so the hook returns immediately
+        # (Windows removes hooks that block), and the Tk thread runs the handler
+        handler = self._hotkey_handlers.get(key)
+        if handler is not None:
+            self._ui_q.put_nowait(handler)
+
+    def _drain_ui_queue(self) -> None:
+        try:
+            while True:
+                try:
+                    handler = self._ui_q.get_nowait()
+                except queue.Empty:
+                    break
+                handler()
+        finally:
+            # Keep polling even if a handler raised, or hotkeys and playback callbacks would stop arriving
+            self._ui_poll_id = self.after(self.UI_POLL_MS, self._drain_ui_queue)
 
     def _on_rec(self) -> None:
         if self._state == self.STATE_IDLE:
@@ -578,18 +1191,26 @@ class App(ctk.CTk):
             self._stop_play()
 
     def _start_countdown(self, action: str) -> None:
+        if self._loads_pending:
+            # The loaded macro would replace self.macro in the middle of recording/playback
+            self._toast("Still loading a macro")
+            return
         self._state = self.STATE_COUNTDOWN
         self._pending = action
-        self._countdown = self.COUNTDOWN_SECONDS
+        self._countdown_deadline = time.monotonic() + self.COUNTDOWN_SECONDS
         self._update_state()
         self._do_countdown()
         self._start_blink()
 
     def _do_countdown(self) -> None:
-        if self._countdown > 0:
-            self.status_label.configure(text=str(self._countdown))
-            self._countdown -= 1
-            self._countdown_id = self.after(1000, self._do_countdown)
+        # Ticks are scheduled against a fixed deadline, so time spent elsewhere in Tk doesn't accumulate
+        remaining = self._countdown_deadline - time.monotonic()
+        if remaining > 0:
+            shown = math.ceil(remaining)
+            self.status_label.configure(text=str(shown))
+            # Wake when the displayed number should drop (remaining reaches shown - 1)
+            next_ms = max(1, math.ceil((remaining - (shown - 1)) * 1000))
+            self._countdown_id = self.after(next_ms, self._do_countdown)
         else:
             self._stop_blink()
             if self._pending == "record":
@@ -620,17 +1241,17 @@ class App(ctk.CTk):
             self._toast(f"Recorded {len(events)} events")
 
     def _start_play(self) -> None:
-        self._state = self.STATE_PLAYING
+        # Compile the playback plan before leaving the countdown, so a bad macro can't leave the UI in "Playing"
         try:
-            loop = int(self.loop_var.get())
-            if loop < 0:
-                loop = 0  # 0 means infinite
-            elif loop > 1000:  # Reasonable upper limit
-                loop = 1000
-        except (ValueError, TypeError):
-            loop = 1
-        self.player.set_events(self.macro.events)
-        self.player.set_loop(loop)
+            self.player.set_events(self.macro.events)
+        except Exception as e:
+            logger.error(f"Failed to prepare playback: {e}", exc_info=True)
+            self._state = self.STATE_IDLE
+            self._update_state()
+            self._toast(f"Playback failed: {str(e)}")
+            return
+        self._state = self.STATE_PLAYING
+        self.player.set_loop(self._loop_count)
         self.player.start()
         self._start_blink()
         self._update_state()
@@ -655,140 +1276,215 @@ class App(ctk.CTk):
         if self._blink_id:
             self.after_cancel(self._blink_id)
             self._blink_id = None
-        self.configure(fg_color=self.COLORS["idle"])
+        self._set_bg(self._bg_off)
 
     def _do_blink(self) -> None:
         if self._state == self.STATE_IDLE:
             return
-        color = {
-            self.STATE_COUNTDOWN: "countdown",
-            self.STATE_RECORDING: "recording",
-            self.STATE_PLAYING: "playing",
-        }.get(self._state, "idle")
-        bg = self.COLORS[color] if self._blink_on else self.COLORS["idle"]
-        self.configure(fg_color=bg)
+        bg = self._bg_on[self._state] if self._blink_on else self._bg_off
+        self._set_bg(bg)
         self._blink_on = not self._blink_on
         self._blink_id = self.after(self.BLINK_INTERVAL_MS, self._do_blink)
 
+    def _set_bg(self, color: str) -> None:
+        # configure(fg_color=...) redraws the whole window, so skip it when nothing changes
+        if color != self._last_bg:
+            self.configure(fg_color=color)
+            self._last_bg = color
+
+    def _validate_loop_input(self, value: str) -> bool:
+        """
+        Validate loop_entry as the user types and cache the parsed loop count.
+        
+        Args:
+            value: Entry text if the edit is allowed (Tk's %P substitution)
+            
+        Returns:
+            True to accept the edit, False to reject it
+        """
+        if value == "":
+            self._loop_count = 1  # Empty field plays once
+            return True
+        if not (value.isascii() and value.isdigit()):
+            return False
+        self._loop_count = min(int(value), 1000)  # 0 means infinite; 1000 is a reasonable upper limit
+        return True
+
     def _update_state(self) -> None:
-        if self._state == self.STATE_IDLE:
-            self.status_label.configure(text="Idle")
-            self.rec_btn.configure(state="normal", fg_color="#c0392b")
-            self.stop_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.play_btn.configure(state="normal" if self.macro.events else "disabled",
-                                     fg_color="#2980b9" if self.macro.events else "#7f8c8d")
-            self.loop_entry.configure(state="normal")
-        elif self._state == self.STATE_COUNTDOWN:
-            self.rec_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.stop_btn.configure(state="normal", fg_color="#e74c3c")
-            self.play_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.loop_entry.configure(state="disabled")
-        elif self._state == self.STATE_RECORDING:
-            self.status_label.configure(text="● Recording")
-            self.rec_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.stop_btn.configure(state="normal", fg_color="#e74c3c")
-            self.play_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.loop_entry.configure(state="disabled")
-        elif self._state == self.STATE_PLAYING:
-            self.status_label.configure(text="▶ Playing")
-            self.rec_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.stop_btn.configure(state="normal", fg_color="#e74c3c")
-            self.play_btn.configure(state="disabled", fg_color="#7f8c8d")
-            self.loop_entry.configure(state="disabled")
+        has_events = bool(self.macro.events)
+        if (self._state, has_events) == (self._last_rendered_state, self._last_has_events):
+            self._update_info()
+            return
+        self._last_rendered_state, self._last_has_events = self._state, has_events
+        status = self._STATUS_TEXT.get(self._state)
+        if status is not None:  # Countdown text is driven by _do_countdown
+            self.status_label.configure(text=status)
+        buttons = (self.rec_btn, self.stop_btn, self.play_btn)
+        for i, cfg in enumerate(self._STATE_BUTTON_CONFIG[self._state]):
+            if cfg is None:
+                cfg = self._BTN_PLAY_READY if has_events else self._BTN_DISABLED
+            # Each configure() redraws the button's canvas, so only touch buttons whose look changes
+            if cfg is not self._applied_btn_cfg[i]:
+                buttons[i].configure(**cfg)
+                self._applied_btn_cfg[i] = cfg
+        self.loop_entry.configure(state="normal" if self._state == self.STATE_IDLE else "disabled")
         self._update_info()
 
     def _update_info(self) -> None:
         if self._state == self.STATE_RECORDING:
-            count = self.recorder.event_count()
-            self.info_label.configure(text=f"{count} events | Recording...")
+            text = f"{self.recorder.event_count()} events | Recording..."
         else:
-            count = len(self.macro.events)
-            dur = self.macro.duration
-            self.info_label.configure(text=f"{count} events | {dur:.1f}s")
+            text = f"{len(self.macro.events)} events | {self.macro.duration:.1f}s"
+        # Skip the label redraw when nothing visible changed
+        if text == self._last_info_text:
+            return
+        self._last_info_text = text
+        self.info_label.configure(text=text)
+
+    def _schedule_info_update(self) -> None:
+        # Called per recorded event from listener threads: queue at most one refresh until it runs.
+        # The refresh goes through the UI queue, so the listener threads never call into Tk
+        if self._info_pending:
+            return
+        self._info_pending = True
+        self._ui_q.put_nowait(self._flush_info)
+
+    def _flush_info(self) -> None:
+        self._info_pending = False
+        self._update_info()
 
     def _toast(self, msg: str) -> None:
+        # A new toast replaces the pending revert instead of stacking another timer
+        if self._toast_after_id:
+            self.after_cancel(self._toast_after_id)
         self.status_label.configure(text=msg, text_color="#f1c40f")
-        self.after(self.TOAST_DURATION_MS, lambda: self.status_label.configure(text="Idle", text_color="white") if self._state == self.STATE_IDLE else None)
+        self._toast_after_id = self.after(self.TOAST_DURATION_MS, self._toast_revert)
+
+    def _toast_revert(self) -> None:
+        self._toast_after_id = None
+        if self._state == self.STATE_IDLE:
+            self.status_label.configure(text="Idle", text_color="white")
+
+    def _validate_path(self, path: str) -> Optional[str]:
+        """
+        Normalize a path from a file dialog and reject path traversal attempts.
+        
+        Args:
+            path: Path returned by the file dialog
+            
+        Returns:
+            Absolute normalized path, or None (after notifying the user) if rejected
+        """
+        # abspath() also normalizes, and only consults the working directory for relative paths
+        normalized_path = os.path.abspath(path)
+        if any(part == ".." or part.startswith("~") for part in normalized_path.split(os.sep)):
+            self._toast("Invalid file path")
+            logger.warning(f"Path traversal attempt detected: {path}")
+            return None
+        return normalized_path
 
     def _save(self) -> None:
         if not self.macro.events:
             self._toast("No data available")
             return
         path = filedialog.asksaveasfilename(
-            defaultextension=".json",
-            filetypes=[("JSON", "*.json")],
+            defaultextension=".epmb",
+            filetypes=[("EventPlayback macro", "*.epmb"), ("JSON", "*.json")],
         )
         if path:
             try:
-                # Path validation
-                if not os.path.isabs(path):
-                    path = os.path.abspath(path)
-                # Normalize path to prevent path traversal attacks
-                normalized_path = os.path.normpath(path)
-                # Check for path traversal attempts (more robust check)
-                path_parts = normalized_path.split(os.sep)
-                if any(part == ".." or part.startswith("~") for part in path_parts):
-                    self._toast("Invalid file path")
-                    logger.warning(f"Path traversal attempt detected: {path}")
+                normalized_path = self._validate_path(path)
+                if normalized_path is None:
                     return
-                # Ensure directory exists
-                dir_path = os.path.dirname(normalized_path)
-                if dir_path and not os.path.exists(dir_path):
-                    os.makedirs(dir_path, exist_ok=True)
-                # Save file
-                with open(normalized_path, "w", encoding="utf-8") as f:
-                    json.dump(self.macro.to_dict(), f, ensure_ascii=False, indent=2)
-                self._toast("Saved")
-            except PermissionError:
-                self._toast("File is in use")
-            except OSError as e:
-                self._toast(f"Save error: {str(e)}")
+                # Snapshot the event list so a new recording can't change it mid-write
+                snapshot = Macro(name=self.macro.name, events=list(self.macro.events),
+                                 created_at=self.macro.created_at)
+                future = self._io_executor.submit(save_macro, snapshot, normalized_path)
+                self._await_io(future, self._on_saved)
             except Exception as e:
                 self._toast(f"Save failed: {str(e)}")
 
+    def _on_saved(self, future: "Future[None]") -> None:
+        try:
+            future.result()
+            self._toast("Saved")
+        except PermissionError:
+            self._toast("File is in use")
+        except OSError as e:
+            self._toast(f"Save error: {str(e)}")
+        except Exception as e:
+            self._toast(f"Save failed: {str(e)}")
+
     def _open(self) -> None:
-        path = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+        path = filedialog.askopenfilename(filetypes=[("Macro files", "*.epmb *.json"),
+                                                     ("EventPlayback macro", "*.epmb"), ("JSON", "*.json")])
         if path:
             try:
-                # Path validation
-                if not os.path.isabs(path):
-                    path = os.path.abspath(path)
-                # Normalize path to prevent path traversal attacks
-                normalized_path = os.path.normpath(path)
-                # Check for path traversal attempts (more robust check)
-                path_parts = normalized_path.split(os.sep)
-                if any(part == ".." or part.startswith("~") for part in path_parts):
-                    self._toast("Invalid file path")
-                    logger.warning(f"Path traversal attempt detected: {path}")
+                normalized_path = self._validate_path(path)
+                if normalized_path is None:
                     return
                 # Verify file exists and is a file (not a directory)
                 if not os.path.isfile(normalized_path):
                     self._toast("File not found")
                     return
-                with open(normalized_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.macro = Macro.from_dict(data)
-                self._update_info()
-                self._update_state()
-                self._toast(f"Loaded {len(self.macro.events)} events")
-            except FileNotFoundError:
-                self._toast("File not found")
-            except json.JSONDecodeError as e:
-                self._toast(f"JSON format error: {str(e)}")
-            except KeyError as e:
-                self._toast(f"Missing required field: {str(e)}")
-            except ValueError as e:
-                self._toast(f"Data format error: {str(e)}")
+                future = self._io_executor.submit(load_macro, normalized_path)
+                self._loads_pending += 1
+                self._await_io(future, self._on_loaded)
             except Exception as e:
                 self._toast(f"Load failed: {str(e)}")
 
+    def _on_loaded(self, future: "Future[Macro]") -> None:
+        self._loads_pending -= 1
+        try:
+            macro = future.result()
+            if self._state != self.STATE_IDLE:
+                # Opened while recording/playing: don't swap the macro out from under it
+                self._toast("Load discarded: recording or playback in progress")
+                return
+            self.macro = macro
+            self._update_info()
+            self._update_state()
+            self._toast(f"Loaded {len(self.macro.events)} events")
+        except FileNotFoundError:
+            self._toast("File not found")
+        except json.JSONDecodeError as e:
+            self._toast(f"JSON format error: {str(e)}")
+        except KeyError as e:
+            self._toast(f"Missing required field: {str(e)}")
+        except ValueError as e:
+            self._toast(f"Data format error: {str(e)}")
+        except Exception as e:
+            self._toast(f"Load failed: {str(e)}")
+
+    def _await_io(self, future: Future, on_done: Callable[[Future], None]) -> None:
+        """
+        Call on_done(future) on the Tk thread once a background save/load finishes.
+        
+        The future is polled with after() rather than given a done-callback, so the
+        worker thread never calls into Tk (and closing the window can wait on it safely).
+        
+        Args:
+            future: Future returned by the I/O executor
+            on_done: Completion handler, called with the finished future
+        """
+        if future.done():
+            on_done(future)
+        else:
+            self.after(self.IO_POLL_MS, self._await_io, future, on_done)
+
     def _on_close(self) -> None:
+        # Cancel pending timers so none of them fire against a half-destroyed window
+        self._state = self.STATE_IDLE
+        for after_id in (self._blink_id, self._countdown_id, self._toast_after_id, self._ui_poll_id):
+            if after_id:
+                try:
+                    self.after_cancel(after_id)
+                except TclError:
+                    pass
         # Clean up hotkeys
         try:
-            keyboard.unhook_all()
-            # clear_all_hotkeys may not exist in all versions of keyboard library
-            if hasattr(keyboard, 'clear_all_hotkeys'):
-                keyboard.clear_all_hotkeys()
+            if self._hotkey_listener:
+                self._hotkey_listener.stop()
         except Exception as e:
             logger.error(f"Hotkey cleanup error: {e}", exc_info=True)
         # Stop recording/playing
@@ -796,8 +1492,30 @@ class App(ctk.CTk):
             self.recorder.stop()
         if self.player.is_playing():
             self.player.stop()
+        # Let a save in progress finish writing before the process exits
+        self._io_executor.shutdown(wait=True)
         self.destroy()
 
 
-if __name__ == "__main__":
+def _main() -> None:
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    # DPI Awareness setting (Windows) - Prevents coordinate misalignment; must run before any window exists
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(2)  # Per-Monitor DPI Aware
+    except Exception:
+        try:
+            ctypes.windll.user32.SetProcessDPIAware()  # System DPI Aware (fallback)
+        except Exception:
+            pass
+    # Theme setting
+    ctk.set_appearance_mode("dark")
     App().mainloop()
+
+
+if __name__ == "__main__":
+    _main()
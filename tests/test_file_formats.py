@@ -0,0 +1,80 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Event, EventType, Macro, load_binary, load_macro, save_binary, save_macro  # noqa: E402
+
+
+def _sample_macro() -> Macro:
+    return Macro(name="tëst", created_at="2024-01-01T00:00:00", events=[
+        Event(EventType.MOUSE_MOVE, 0.0, x=-5, y=2),
+        Event(EventType.MOUSE_CLICK, 0.25, x=1, y=1, button="left", pressed=True),
+        Event(EventType.MOUSE_CLICK, 0.5, x=1, y=1, button="left", pressed=False),
+        Event(EventType.MOUSE_SCROLL, 0.75, x=1, y=1, scroll_dx=0, scroll_dy=-3),
+        Event(EventType.KEY_PRESS, 1.0, key="ä", pressed=True),
+        Event(EventType.KEY_RELEASE, 1.5, key="ä", pressed=False),
+    ])
+
+
+class FileFormatTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._dir.name, name)
+
+    def test_round_trip(self) -> None:
+        macro = _sample_macro()
+        for name in ("m.epmb", "m.json", "m.txt", "m"):
+            with self.subTest(name=name):
+                save_macro(macro, self._path(name))
+                self.assertEqual(load_macro(self._path(name)).to_dict(), macro.to_dict())
+
+    def test_binary_empty_macro(self) -> None:
+        save_binary(Macro(), self._path("empty.epmb"))
+        self.assertEqual(load_binary(self._path("empty.epmb")).events, [])
+
+    def test_binary_rejects_truncated_file(self) -> None:
+        save_binary(_sample_macro(), self._path("m.epmb"))
+        with open(self._path("m.epmb"), "rb") as f:
+            data = f.read()
+        with open(self._path("bad.epmb"), "wb") as f:
+            f.write(data[:-3])
+        with self.assertRaises(ValueError):
+            load_binary(self._path("bad.epmb"))
+
+    def test_binary_converts_float_coordinates(self) -> None:
+        macro = Macro.from_dict({"events": [{"type": "mouse_move", "timestamp": 0, "x": 10.0, "y": -3.0}]})
+        save_binary(macro, self._path("m.epmb"))
+        event = load_binary(self._path("m.epmb")).events[0]
+        self.assertEqual((event.x, event.y), (10, -3))
+
+    def test_binary_rejects_out_of_range_coordinates(self) -> None:
+        macro = Macro(events=[Event(EventType.MOUSE_MOVE, 0.0, x=2 ** 31, y=0)])
+        with self.assertRaises(ValueError):
+            save_binary(macro, self._path("m.epmb"))
+
+    def test_binary_rejects_non_string_key(self) -> None:
+        macro = Macro.from_dict({"events": [{"type": "key_press", "timestamp": 0, "key": 5, "pressed": True}]})
+        with self.assertRaises(ValueError):
+            save_binary(macro, self._path("m.epmb"))
+
+    def test_binary_rejects_out_of_range_timestamp(self) -> None:
+        for ts in (float("nan"), float("inf"), 1e300):
+            with self.subTest(timestamp=ts):
+                save_binary(Macro(events=[Event(EventType.MOUSE_MOVE, ts, x=0, y=0)]), self._path("m.epmb"))
+                with self.assertRaises(ValueError):
+                    load_binary(self._path("m.epmb"))
+
+    def test_rejects_out_of_range_timestamp(self) -> None:
+        for ts in (float("nan"), float("inf"), -float("inf"), 1e300):
+            with self.subTest(timestamp=ts), self.assertRaises(ValueError):
+                Macro.from_dict({"events": [{"type": "mouse_move", "timestamp": ts, "x": 0, "y": 0}]})
+
+
+if __name__ == "__main__":
+    unittest.main()
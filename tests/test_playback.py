@@ -0,0 +1,51 @@
+import ctypes
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import Macro, Player, _WinMouseMover  # noqa: E402
+
+
+class _FakeUser32:
+    """Stands in for ctypes.windll.user32: a 1920x1080 virtual desktop that records SendInput moves."""
+
+    def __init__(self) -> None:
+        self.moves = []
+
+    def GetSystemMetrics(self, index: int) -> int:
+        return {76: 0, 77: 0, 78: 1920, 79: 1080}[index]
+
+    def SendInput(self, count: int, ref, size: int) -> int:
+        mi = ref._obj.mi
+        self.moves.append((mi.dx, mi.dy))
+        return count
+
+
+class WinMouseMoverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.user32 = _FakeUser32()
+        patcher = mock.patch.object(ctypes, "windll", mock.Mock(user32=self.user32), create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalize_accepts_float_coordinates(self) -> None:
+        mover = _WinMouseMover()
+        self.assertEqual(mover.normalize(10.0, 5.0), mover.normalize(10, 5))
+        self.assertIsInstance(mover.normalize(10.0, 5.0)[0], int)
+
+    def test_plan_plays_float_coordinates(self) -> None:
+        macro = Macro.from_dict({"events": [{"type": "mouse_move", "timestamp": 0, "x": 960.0, "y": 540.0}]})
+        player = Player()
+        player._win_mover = _WinMouseMover()
+        with mock.patch.object(Player, "_ensure_controllers"):
+            player.set_events(macro.events)
+        for _, _, fn, args in player._plan:
+            fn(*args)
+        self.assertEqual(self.user32.moves, [player._win_mover.normalize(960, 540)])
+
+
+if __name__ == "__main__":
+    unittest.main()